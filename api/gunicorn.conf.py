@@ -0,0 +1,27 @@
+# Multi-worker deployment: gunicorn -c api/gunicorn.conf.py main:app
+import multiprocessing
+import sys
+import os
+from dotenv import load_dotenv
+
+api_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(api_dir, '..', 'src'))
+
+from database_factory import create_database_manager
+from session_store import require_secret_key
+
+load_dotenv(os.path.join(api_dir, '.env'))
+
+# Fails in the master process instead of in every worker
+require_secret_key()
+
+chdir = api_dir
+bind = f"{os.getenv('API_HOST', '127.0.0.1')}:{os.getenv('API_PORT', '8080')}"
+workers = int(os.getenv('API_WORKERS', multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+
+def on_starting(server):
+    # Runs once in the master process before any worker is spawned
+    if not create_database_manager().initialize_db_once():
+        raise RuntimeError("Failed to initialize database")
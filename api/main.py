@@ -3,16 +3,25 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Optional, List
+from functools import lru_cache
+from dotenv import load_dotenv
+import secrets
 import sys
 import os
 
 # Add src directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from database_manager_sqlite import DatabaseManager
+from database_factory import create_database_manager
 from auth_manager import AuthManager
 from vault_manager import VaultManager
 from crypto_utils import CryptoUtils
+from session_store import SessionStore, require_secret_key
+from write_queue import WriteQueue
+
+load_dotenv(os.path.join(os.path.dirname(__file__), '.env'))
+
+require_secret_key()
 
 app = FastAPI(title="Secure Vault API", version="1.0.0")
 security = HTTPBearer()
@@ -26,11 +35,38 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize managers
-db_manager = DatabaseManager()
-crypto_utils = CryptoUtils()
-auth_manager = AuthManager(db_manager, crypto_utils)
-vault_manager = VaultManager(db_manager, crypto_utils)
+# Managers are created on first use so that spawning a worker only pays for
+# importing FastAPI; the database backend is picked by DB_BACKEND
+@lru_cache(maxsize=None)
+def get_db_manager():
+    db_manager = create_database_manager()
+    if not db_manager.initialize_db_once():
+        raise RuntimeError("Failed to initialize database")
+    return db_manager
+
+@lru_cache(maxsize=None)
+def get_crypto_utils():
+    return CryptoUtils()
+
+@lru_cache(maxsize=None)
+def get_auth_manager():
+    return AuthManager(get_db_manager(), get_crypto_utils())
+
+@lru_cache(maxsize=None)
+def get_write_queue():
+    # Opt-in group commit for vault writes, with its own connection
+    if os.getenv('WRITE_QUEUE', '').lower() not in ('1', 'true', 'yes'):
+        return None
+    get_db_manager()
+    return WriteQueue(create_database_manager())
+
+@lru_cache(maxsize=None)
+def get_vault_manager():
+    return VaultManager(get_db_manager(), get_crypto_utils(), get_write_queue())
+
+@lru_cache(maxsize=None)
+def get_session_store():
+    return SessionStore(get_db_manager(), get_crypto_utils())
 
 # Pydantic models
 class UserCreate(BaseModel):
@@ -64,20 +100,13 @@ class VaultEntryResponse(BaseModel):
     created_at: str
     updated_at: str
 
-# Session storage (in production, use Redis or proper session management)
-active_sessions = {}
-
-@app.on_event("startup")
-async def startup_event():
-    try:
-        print("Initializing database...")
-        if not db_manager.initialize_db():
-            print("Failed to initialize database")
-            raise Exception("Failed to initialize database")
-        print("Database initialized successfully")
-    except Exception as e:
-        print(f"Startup error: {e}")
-        raise
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Flush pending vault writes before the worker exits
+    write_queue = get_write_queue() if get_write_queue.cache_info().currsize else None
+    if write_queue:
+        await write_queue.close()
+        print(f"Write queue stats: {write_queue.stats()}")
 
 @app.get("/")
 async def root():
@@ -91,7 +120,7 @@ async def register(user: UserCreate):
     if len(user.password) < 8:
         raise HTTPException(status_code=400, detail="Password must be at least 8 characters")
     
-    success = auth_manager.register_user(user.username, user.password)
+    success = get_auth_manager().register_user(user.username, user.password)
     if not success:
         raise HTTPException(status_code=400, detail="Username already exists")
     
@@ -99,16 +128,14 @@ async def register(user: UserCreate):
 
 @app.post("/api/login", response_model=dict)
 async def login(user: UserLogin):
-    result = auth_manager.login_user(user.username, user.password)
+    result = get_auth_manager().login_user(user.username, user.password)
     if not result:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
-    # Create session token (simple implementation)
-    session_token = f"session_{result['user']['id']}_{hash(user.username + user.password)}"
-    active_sessions[session_token] = {
-        'user': result['user'],
-        'master_key': result['master_key']
-    }
+    # Random session token; the store keeps only its hash
+    session_token = f"session_{result['user']['id']}_{secrets.token_urlsafe(32)}"
+    if not get_session_store().create_session(session_token, result['user'], result['master_key']):
+        raise HTTPException(status_code=500, detail="Failed to create session")
     
     return {
         "message": "Login successful",
@@ -118,18 +145,15 @@ async def login(user: UserLogin):
 
 @app.get("/api/check-username/{username}")
 async def check_username(username: str):
-    existing_user = db_manager.fetch_one(
-        "SELECT id FROM users WHERE username = ?", (username,)
-    )
-    return {"available": existing_user is None}
+    return {"available": not get_auth_manager().user_exists(username)}
 
 @app.post("/api/vault/entries", response_model=dict)
 async def create_vault_entry(entry: VaultEntryCreate, credentials: HTTPAuthorizationCredentials = Depends(security)):
-    session = active_sessions.get(credentials.credentials)
+    session = get_session_store().get_session(credentials.credentials)
     if not session:
         raise HTTPException(status_code=401, detail="Invalid session")
     
-    success = vault_manager.add_entry(
+    success = await get_vault_manager().add_entry_async(
         session['user']['id'],
         entry.service_name,
         entry.username,
@@ -145,11 +169,11 @@ async def create_vault_entry(entry: VaultEntryCreate, credentials: HTTPAuthoriza
 
 @app.get("/api/vault/entries", response_model=List[VaultEntryResponse])
 async def get_vault_entries(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    session = active_sessions.get(credentials.credentials)
+    session = get_session_store().get_session(credentials.credentials)
     if not session:
         raise HTTPException(status_code=401, detail="Invalid session")
     
-    entries = vault_manager.get_all_entries(session['user']['id'], session['master_key'])
+    entries = get_vault_manager().get_all_entries(session['user']['id'], session['master_key'])
     return [
         VaultEntryResponse(
             id=entry['id'],
@@ -165,11 +189,11 @@ async def get_vault_entries(credentials: HTTPAuthorizationCredentials = Depends(
 
 @app.get("/api/vault/entries/{service_name}")
 async def get_vault_entry_by_service(service_name: str, credentials: HTTPAuthorizationCredentials = Depends(security)):
-    session = active_sessions.get(credentials.credentials)
+    session = get_session_store().get_session(credentials.credentials)
     if not session:
         raise HTTPException(status_code=401, detail="Invalid session")
     
-    entry = vault_manager.get_entry_by_service(session['user']['id'], service_name, session['master_key'])
+    entry = get_vault_manager().get_entry_by_service(session['user']['id'], service_name, session['master_key'])
     if not entry:
         raise HTTPException(status_code=404, detail="Entry not found")
     
@@ -185,11 +209,11 @@ async def get_vault_entry_by_service(service_name: str, credentials: HTTPAuthori
 
 @app.put("/api/vault/entries/{entry_id}")
 async def update_vault_entry(entry_id: int, entry: VaultEntryUpdate, credentials: HTTPAuthorizationCredentials = Depends(security)):
-    session = active_sessions.get(credentials.credentials)
+    session = get_session_store().get_session(credentials.credentials)
     if not session:
         raise HTTPException(status_code=401, detail="Invalid session")
     
-    success = vault_manager.update_entry(
+    success = await get_vault_manager().update_entry_async(
         session['user']['id'],
         entry_id,
         entry.password,
@@ -204,11 +228,11 @@ async def update_vault_entry(entry_id: int, entry: VaultEntryUpdate, credentials
 
 @app.delete("/api/vault/entries/{entry_id}")
 async def delete_vault_entry(entry_id: int, credentials: HTTPAuthorizationCredentials = Depends(security)):
-    session = active_sessions.get(credentials.credentials)
+    session = get_session_store().get_session(credentials.credentials)
     if not session:
         raise HTTPException(status_code=401, detail="Invalid session")
     
-    success = vault_manager.delete_entry(session['user']['id'], entry_id)
+    success = await get_vault_manager().delete_entry_async(session['user']['id'], entry_id)
     if not success:
         raise HTTPException(status_code=500, detail="Failed to delete entry")
     
@@ -216,34 +240,42 @@ async def delete_vault_entry(entry_id: int, credentials: HTTPAuthorizationCreden
 
 @app.delete("/api/user/delete")
 async def delete_user_account(user: UserLogin, credentials: HTTPAuthorizationCredentials = Depends(security)):
-    session = active_sessions.get(credentials.credentials)
+    session = get_session_store().get_session(credentials.credentials)
     if not session:
         raise HTTPException(status_code=401, detail="Invalid session")
     
     # Verify password
-    auth_result = auth_manager.login_user(user.username, user.password)
+    auth_result = get_auth_manager().login_user(user.username, user.password)
     if not auth_result or auth_result['user']['id'] != session['user']['id']:
         raise HTTPException(status_code=401, detail="Invalid password")
     
-    # Delete all vault entries first
-    db_manager.execute_query("DELETE FROM vault_entries WHERE user_id = ?", (session['user']['id'],))
-    
-    # Delete user account
-    success = db_manager.execute_query("DELETE FROM users WHERE id = ?", (session['user']['id'],))
+    # Delete vault entries and user account
+    success = get_auth_manager().delete_user(session['user']['id'], session['user']['username'])
     if not success:
         raise HTTPException(status_code=500, detail="Failed to delete account")
     
-    # Remove session
-    del active_sessions[credentials.credentials]
+    # Remove all sessions of the deleted user
+    get_session_store().delete_user_sessions(session['user']['id'])
     
     return {"message": "Account deleted successfully"}
 
 @app.post("/api/logout")
 async def logout(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    if credentials.credentials in active_sessions:
-        del active_sessions[credentials.credentials]
+    get_session_store().delete_session(credentials.credentials)
     return {"message": "Logged out successfully"}
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="127.0.0.1", port=8080)
+
+    # Create the schema once here instead of racing in every worker
+    try:
+        get_db_manager()
+    except RuntimeError as e:
+        sys.exit(str(e))
+
+    uvicorn.run(
+        "main:app",
+        host=os.getenv('API_HOST', '127.0.0.1'),
+        port=int(os.getenv('API_PORT', '8080')),
+        workers=int(os.getenv('API_WORKERS', '1'))
+    )
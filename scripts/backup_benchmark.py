@@ -0,0 +1,82 @@
+# Backup, verify and restore throughput on a synthetic SQLite vault:
+# python scripts/backup_benchmark.py [--size-mb N] [--chunk-mb N] [--workers N] [--dir PATH]
+#
+# Use --size-mb 4096 or more for multi-GB measurements; the database and the
+# archive are built under --dir (default: the system temp directory).
+import argparse
+import base64
+import tempfile
+import time
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from database_manager_sqlite import DatabaseManager
+from crypto_utils import CryptoUtils
+from backup_manager import BackupManager, CHUNK_SIZE
+
+USERS = 1000
+# Roughly the size of a Fernet token for a short password plus notes
+ENTRY_BYTES = 400
+
+
+def build_database(db_manager: DatabaseManager, size_mb: int):
+    # Random base64 compresses about as well as the real Fernet tokens
+    db_manager.initialize_db_once()
+    connection = db_manager.connection
+
+    connection.executemany(
+        """INSERT INTO users (username, password_hash, salt, master_key_salt, encrypted_master_key)
+           VALUES (?, ?, ?, ?, ?)""",
+        ((f"user{i}", os.urandom(60), os.urandom(29), os.urandom(32), base64.urlsafe_b64encode(os.urandom(100)))
+         for i in range(USERS))
+    )
+
+    entries = size_mb * 1024 * 1024 // ENTRY_BYTES
+    batch = 10000
+    for start in range(0, entries, batch):
+        connection.executemany(
+            """INSERT INTO vault_entries (user_id, service_name, username, encrypted_password, encrypted_notes)
+               VALUES (?, ?, ?, ?, ?)""",
+            ((i % USERS + 1, f"service{i}", f"login{i}",
+              base64.urlsafe_b64encode(os.urandom(120)), base64.urlsafe_b64encode(os.urandom(120)))
+             for i in range(start, min(start + batch, entries)))
+        )
+        connection.commit()
+    connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vault backups")
+    parser.add_argument('--size-mb', type=int, default=512, help="synthetic database size")
+    parser.add_argument('--chunk-mb', type=int, default=CHUNK_SIZE // (1024 * 1024), help="chunk size in MB")
+    parser.add_argument('--workers', type=int, default=None, help="compression/encryption threads")
+    parser.add_argument('--dir', default=None, help="directory for the database and archive")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as temp_dir:
+        db_manager = DatabaseManager(os.path.join(temp_dir, 'vault.db'))
+
+        start = time.perf_counter()
+        build_database(db_manager, args.size_mb)
+        size = os.path.getsize(db_manager.db_path) / (1024 * 1024)
+        print(f"Built {size:.0f} MB database in {time.perf_counter() - start:.1f} s")
+
+        backup_manager = BackupManager(db_manager, CryptoUtils(), args.chunk_mb * 1024 * 1024, args.workers)
+        archive_path = os.path.join(temp_dir, 'vault.svbak')
+
+        for action, run in (
+            ("backup", lambda: backup_manager.create_backup(archive_path, "benchmark")),
+            ("verify", lambda: backup_manager.verify_backup(archive_path, "benchmark")),
+            ("restore", lambda: backup_manager.restore_backup(archive_path, "benchmark")),
+        ):
+            stats = run()
+            print(f"{action:>8}: {stats['throughput_mb_s']:8.1f} MB/s  {stats['seconds']:7.2f} s  "
+                  f"archive {stats['archive_bytes'] / (1024 * 1024):.0f} MB")
+
+        db_manager.disconnect()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# Cold start report for the API: python scripts/startup_report.py [--top N]
+#
+# Imports api/main.py in a fresh interpreter with -X importtime and prints the
+# slowest imports, then times creation of the managers that are deferred until
+# the first request.
+import argparse
+import subprocess
+import tempfile
+import sys
+import os
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api')
+
+MANAGERS_SCRIPT = """
+import time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+main.get_auth_manager(); main.get_vault_manager(); main.get_session_store()
+print(f"{imported - start:.6f} {time.perf_counter() - imported:.6f}")
+"""
+
+
+def parse_importtime(output: str) -> list:
+    # Lines look like "import time:   self [us] |  cumulative | [indent]package"
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return imports
+
+
+def run(code: str, *args) -> subprocess.CompletedProcess:
+    env = dict(os.environ)
+    env.setdefault('SECRET_KEY', 'startup-report')
+    return subprocess.run(
+        [sys.executable, *args, '-c', code],
+        cwd=API_DIR, env=env, capture_output=True, text=True, check=True
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report API cold start time")
+    parser.add_argument('--top', type=int, default=15, help="number of imports to list")
+    args = parser.parse_args()
+
+    # Keep the report away from the real vault database
+    temp_dir = tempfile.TemporaryDirectory()
+    os.environ.setdefault('DB_PATH', os.path.join(temp_dir.name, 'startup_report.db'))
+
+    imports = parse_importtime(run('import main', '-X', 'importtime').stderr)
+    top_level = [entry for entry in imports if entry[3] <= 1]
+
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for name, self_us, cumulative_us, _ in sorted(top_level, key=lambda entry: -entry[2])[:args.top]:
+        print(f"{cumulative_us / 1000:14.1f} {self_us / 1000:9.1f}  {name}")
+
+    import_seconds, managers_seconds = map(float, run(MANAGERS_SCRIPT).stdout.split()[-2:])
+    print()
+    print(f"import main:         {import_seconds * 1000:8.1f} ms")
+    print(f"first manager setup: {managers_seconds * 1000:8.1f} ms (deferred to first request)")
+
+    temp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# Encrypted snapshots of the vault database:
+#   python scripts/vault_backup.py backup vault.svbak
+#   python scripts/vault_backup.py verify vault.svbak
+#   python scripts/vault_backup.py restore vault.svbak
+#
+# The database is chosen from api/.env like the API does (DB_BACKEND, DB_PATH
+# or the DB_* PostgreSQL settings). The passphrase is read from
+# BACKUP_PASSPHRASE or prompted for. Stop the API before restoring.
+import argparse
+import getpass
+import sys
+import os
+from dotenv import load_dotenv
+
+root_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(os.path.join(root_dir, 'src'))
+
+from database_factory import create_database_manager
+from crypto_utils import CryptoUtils
+from backup_manager import BackupManager, BackupError, CHUNK_SIZE
+
+
+def read_passphrase(confirm: bool) -> str:
+    passphrase = os.getenv('BACKUP_PASSPHRASE')
+    if passphrase:
+        return passphrase
+
+    passphrase = getpass.getpass("Backup passphrase: ")
+    if confirm and getpass.getpass("Repeat passphrase: ") != passphrase:
+        sys.exit("Passphrases do not match")
+    return passphrase
+
+
+def print_stats(action: str, stats: dict):
+    print(f"{action} {stats['bytes'] / (1024 * 1024):.1f} MB "
+          f"({stats['archive_bytes'] / (1024 * 1024):.1f} MB archive) "
+          f"in {stats['seconds']:.2f} s, {stats['throughput_mb_s']:.1f} MB/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Back up and restore the vault database")
+    parser.add_argument('action', choices=['backup', 'verify', 'restore'])
+    parser.add_argument('archive', help="archive file")
+    parser.add_argument('--chunk-mb', type=int, default=CHUNK_SIZE // (1024 * 1024), help="chunk size in MB")
+    parser.add_argument('--workers', type=int, default=None, help="compression/encryption threads")
+    args = parser.parse_args()
+
+    load_dotenv(os.path.join(root_dir, 'api', '.env'))
+
+    db_manager = create_database_manager()
+    backup_manager = BackupManager(db_manager, CryptoUtils(), args.chunk_mb * 1024 * 1024, args.workers)
+
+    try:
+        if args.action == 'backup':
+            print_stats("Backed up", backup_manager.create_backup(args.archive, read_passphrase(confirm=True)))
+        elif args.action == 'verify':
+            stats = backup_manager.verify_backup(args.archive, read_passphrase(confirm=False))
+            print(f"Archive OK: {stats['header']['backend']} backup from {stats['header']['created_at']}")
+            print_stats("Verified", stats)
+        else:
+            print_stats("Restored", backup_manager.restore_backup(args.archive, read_passphrase(confirm=False)))
+    except (BackupError, OSError) as e:
+        sys.exit(f"{args.action.capitalize()} failed: {e}")
+    finally:
+        db_manager.disconnect()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# Vault write throughput with and without the group-commit write queue:
+# python scripts/write_queue_benchmark.py [--writes N] [--batch-size N] [--delay-ms MS]
+import argparse
+import asyncio
+import tempfile
+import time
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from database_manager_sqlite import DatabaseManager
+from crypto_utils import CryptoUtils
+from vault_manager import VaultManager
+from write_queue import WriteQueue
+
+
+async def run_writes(vault: VaultManager, writes: int, master_key: bytes) -> float:
+    start = time.perf_counter()
+    results = await asyncio.gather(*(
+        vault.add_entry_async(1, f"service{i}", "user", "secret", "", master_key)
+        for i in range(writes)
+    ))
+    if vault.write_queue:
+        await vault.write_queue.close()
+    elapsed = time.perf_counter() - start
+
+    if not all(results):
+        raise RuntimeError("Some writes failed")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark group commit of vault writes")
+    parser.add_argument('--writes', type=int, default=2000, help="concurrent add_entry calls")
+    parser.add_argument('--batch-size', type=int, default=64, help="WRITE_BATCH_SIZE")
+    parser.add_argument('--delay-ms', type=float, default=2, help="WRITE_BATCH_DELAY_MS")
+    args = parser.parse_args()
+
+    crypto_utils = CryptoUtils()
+    master_key = crypto_utils.generate_key()
+
+    for mode in ('direct', 'queued'):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = os.path.join(temp_dir, 'vault.db')
+            db_manager = DatabaseManager(db_path)
+            db_manager.initialize_db_once()
+
+            write_queue = None
+            if mode == 'queued':
+                write_queue = WriteQueue(DatabaseManager(db_path), args.batch_size, args.delay_ms)
+
+            elapsed = asyncio.run(run_writes(VaultManager(db_manager, crypto_utils, write_queue), args.writes, master_key))
+            print(f"{mode:>6}: {args.writes / elapsed:10.0f} writes/s ({elapsed:.2f} s)")
+            if write_queue:
+                for name, value in write_queue.stats().items():
+                    print(f"        {name}: {value:.2f}" if isinstance(value, float) else f"        {name}: {value}")
+                write_queue.db_manager.disconnect()
+            db_manager.disconnect()
+
+
+if __name__ == "__main__":
+    main()
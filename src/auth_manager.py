@@ -1,19 +1,51 @@
-from database_manager_sqlite import DatabaseManager
+from typing import Optional, TYPE_CHECKING
+
 from crypto_utils import CryptoUtils
+from user_cache import UserCache
+
+if TYPE_CHECKING:
+    # The backend is chosen at runtime, see database_factory
+    from database_manager_sqlite import DatabaseManager
 
 
 class AuthManager:
-    def __init__(self, db_manager: DatabaseManager, crypto_utils: CryptoUtils):
+    def __init__(self, db_manager: 'DatabaseManager', crypto_utils: CryptoUtils, user_cache: Optional[UserCache] = None):
         self.db_manager = db_manager
         self.crypto_utils = crypto_utils
+        self.user_cache = user_cache if user_cache is not None else UserCache()
+
+    def get_user_record(self, username: str) -> Optional[tuple]:
+        user_data = self.user_cache.get(username)
+        if user_data:
+            return user_data
+
+        user_data = self.db_manager.fetch_one(
+            """SELECT id, username, password_hash, salt, master_key_salt, encrypted_master_key
+               FROM users WHERE username = ?""",
+            (username,)
+        )
+
+        # Unknown usernames are not cached so a registration in another
+        # worker is visible immediately
+        if user_data:
+            self.user_cache.set(username, user_data)
+        return user_data
+
+    def user_exists(self, username: str) -> bool:
+        # Asks the database rather than the cache: it is reachable without
+        # logging in, so it must not load auth records into the cache, and
+        # the cache may still hold a user deleted by another worker
+        return self.db_manager.fetch_one(
+            "SELECT id FROM users WHERE username = ?", (username,)
+        ) is not None
+
+    def invalidate_user(self, username: str):
+        # Call whenever a user's row changes (password change, deletion)
+        self.user_cache.invalidate(username)
 
     def register_user(self, username: str, password: str) -> bool:
         # Check if username already exists
-        existing_user = self.db_manager.fetch_one(
-            "SELECT id FROM users WHERE username = ?", (username,)
-        )
-        
-        if existing_user:
+        if self.user_exists(username):
             return False
 
         # Hash password
@@ -30,19 +62,17 @@ class AuthManager:
         encrypted_master_key = self.crypto_utils.encrypt_master_key(master_key, password_derived_key)
 
         # Store user in database
-        return self.db_manager.execute_query(
+        success = self.db_manager.execute_query(
             """INSERT INTO users (username, password_hash, salt, master_key_salt, encrypted_master_key)
                VALUES (?, ?, ?, ?, ?)""",
             (username, password_hash, salt, master_key_salt, encrypted_master_key)
         )
+        self.invalidate_user(username)
+        return success
 
     def login_user(self, username: str, password: str) -> dict:
-        # Fetch user from database
-        user_data = self.db_manager.fetch_one(
-            """SELECT id, username, password_hash, salt, master_key_salt, encrypted_master_key
-               FROM users WHERE username = ?""",
-            (username,)
-        )
+        # Fetch user from cache or database
+        user_data = self.get_user_record(username)
 
         if not user_data:
             return None
@@ -69,5 +99,13 @@ class AuthManager:
             'master_key': master_key
         }
 
+    def delete_user(self, user_id: int, username: str) -> bool:
+        # Delete all vault entries first
+        self.db_manager.execute_query("DELETE FROM vault_entries WHERE user_id = ?", (user_id,))
+
+        success = self.db_manager.execute_query("DELETE FROM users WHERE id = ?", (user_id,))
+        self.invalidate_user(username)
+        return success
+
     def logout_user(self):
         pass
@@ -0,0 +1,439 @@
+import base64
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import struct
+import tempfile
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Optional, TYPE_CHECKING
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from crypto_utils import CryptoUtils
+
+if TYPE_CHECKING:
+    # The backend is chosen at runtime, see database_factory
+    from database_manager_sqlite import DatabaseManager
+
+# Archive layout:
+#   MAGIC | header length (4 bytes) | header JSON | frames...
+# Each frame holds one zlib-compressed chunk encrypted with AES-GCM:
+#   payload length (4 bytes) | flags (1 byte) | nonce (12 bytes) | ciphertext
+# The associated data binds every chunk to the header, its section and its
+# position, and marks the last chunk of a section, so reordered, swapped or
+# truncated archives fail to decrypt instead of restoring silently.
+MAGIC = b'SVBACKUP'
+FORMAT_VERSION = 1
+CHUNK_SIZE = 4 * 1024 * 1024
+NONCE_SIZE = 12
+TAG_SIZE = 16
+FLAG_LAST = 1
+MAX_HEADER_SIZE = 64 * 1024
+
+_LENGTH = struct.Struct('>I')
+_FRAME = struct.Struct('>IB')
+_CHUNK_AAD = struct.Struct('>IQ?')
+
+
+class BackupError(Exception):
+    pass
+
+
+def _compress(data: bytes) -> bytes:
+    # Vault rows are mostly base64 Fernet tokens, which LZ matching barely
+    # shrinks; Huffman-only deflate is over twice as fast as level 1 for an
+    # archive about a fifth larger
+    compressor = zlib.compressobj(1, zlib.DEFLATED, zlib.MAX_WBITS, 9, zlib.Z_HUFFMAN_ONLY)
+    return compressor.compress(data) + compressor.flush()
+
+
+class _ArchiveCipher:
+    def __init__(self, key: bytes, header: bytes):
+        self.aesgcm = AESGCM(key)
+        self.header_digest = hashlib.sha256(header).digest()
+
+    def _associated_data(self, section: int, chunk: int, last: bool) -> bytes:
+        return self.header_digest + _CHUNK_AAD.pack(section, chunk, last)
+
+    def encode(self, section: int, chunk: int, last: bool, data: bytes) -> bytes:
+        nonce = os.urandom(NONCE_SIZE)
+        ciphertext = self.aesgcm.encrypt(nonce, _compress(data), self._associated_data(section, chunk, last))
+        return _FRAME.pack(NONCE_SIZE + len(ciphertext), FLAG_LAST if last else 0) + nonce + ciphertext
+
+    def decode(self, section: int, chunk: int, last: bool, body: bytes) -> bytes:
+        try:
+            payload = self.aesgcm.decrypt(body[:NONCE_SIZE], body[NONCE_SIZE:], self._associated_data(section, chunk, last))
+        except InvalidTag:
+            raise BackupError("Archive is corrupt or the passphrase is wrong")
+        return zlib.decompress(payload)
+
+
+class _SectionWriter:
+    # File-like sink for one section; compression and encryption of full
+    # chunks run on the archive's thread pool while the caller keeps writing
+    def __init__(self, archive: '_ArchiveWriter', section: int):
+        self.archive = archive
+        self.section = section
+        self.chunk = 0
+        self.buffer = bytearray()
+        self.held = None
+
+    def write(self, data) -> int:
+        self.buffer += data
+        while len(self.buffer) >= self.archive.chunk_size:
+            self._emit(bytes(self.buffer[:self.archive.chunk_size]))
+            del self.buffer[:self.archive.chunk_size]
+        return len(data)
+
+    def _emit(self, data: Optional[bytes]):
+        # One chunk is held back so the last one can be flagged on close
+        if self.held is not None:
+            self.archive.submit(self.section, self.chunk, False, self.held)
+            self.chunk += 1
+        self.held = data
+
+    def close(self):
+        if self.buffer or self.held is None:
+            self._emit(bytes(self.buffer))
+            self.buffer = bytearray()
+        self.archive.submit(self.section, self.chunk, True, self.held)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+
+
+class _ArchiveWriter:
+    def __init__(self, file, key: bytes, header: bytes, chunk_size: int, executor: ThreadPoolExecutor, max_pending: int):
+        self.file = file
+        self.cipher = _ArchiveCipher(key, header)
+        self.chunk_size = chunk_size
+        self.executor = executor
+        self.max_pending = max_pending
+        self.sections = 0
+        self.raw_bytes = 0
+        self.pending = deque()
+
+        file.write(MAGIC + _LENGTH.pack(len(header)) + header)
+
+    def open_section(self) -> _SectionWriter:
+        section = _SectionWriter(self, self.sections)
+        self.sections += 1
+        return section
+
+    def submit(self, section: int, chunk: int, last: bool, data: bytes):
+        self.raw_bytes += len(data)
+        self.pending.append(self.executor.submit(self.cipher.encode, section, chunk, last, data))
+        while len(self.pending) > self.max_pending:
+            self.file.write(self.pending.popleft().result())
+
+    def finish(self):
+        while self.pending:
+            self.file.write(self.pending.popleft().result())
+
+
+class _ArchiveReader:
+    def __init__(self, file, passphrase: str, crypto_utils: CryptoUtils, executor: ThreadPoolExecutor, max_pending: int):
+        self.file = file
+        self.executor = executor
+        self.max_pending = max_pending
+        self.raw_bytes = 0
+
+        if file.read(len(MAGIC)) != MAGIC:
+            raise BackupError("Not a vault backup archive")
+        header_length = _LENGTH.unpack(self._read_exact(_LENGTH.size, "header"))[0]
+        if header_length > MAX_HEADER_SIZE:
+            raise BackupError("Archive header is corrupt")
+        header = self._read_exact(header_length, "header")
+
+        # The header is not authenticated until the first chunk decrypts, so
+        # it is checked here before anything in it is used
+        try:
+            self.header = json.loads(header)
+            if self.header.get('format') != FORMAT_VERSION:
+                raise BackupError(f"Unsupported archive format {self.header.get('format')}")
+            salt = bytes.fromhex(self.header['salt'])
+            chunk_size = self.header['chunk_size']
+            sections = self.header['sections']
+            valid = (
+                isinstance(self.header['backend'], str)
+                and type(chunk_size) is int and chunk_size > 0
+                and isinstance(sections, list) and all(isinstance(name, str) for name in sections)
+            )
+        except (ValueError, KeyError, TypeError, AttributeError):
+            valid = False
+        if not valid:
+            raise BackupError("Archive header is corrupt")
+
+        # Largest frame a writer with this chunk size can produce, with room
+        # for deflate's worst-case expansion
+        self.max_frame = NONCE_SIZE + chunk_size + chunk_size // 1000 + 1024 + TAG_SIZE
+
+        key = _derive_archive_key(crypto_utils, passphrase, salt)
+        self.cipher = _ArchiveCipher(key, header)
+
+    def _read_exact(self, size: int, what: str) -> bytes:
+        data = self.file.read(size)
+        if len(data) != size:
+            raise BackupError(f"Archive is truncated ({what})")
+        return data
+
+    def _iter_chunks(self, section: int):
+        pending = deque()
+        chunk = 0
+        last = False
+
+        while pending or not last:
+            while not last and len(pending) < self.max_pending:
+                length, flags = _FRAME.unpack(self._read_exact(_FRAME.size, "frame"))
+                if length > self.max_frame:
+                    raise BackupError("Archive is corrupt (oversized chunk)")
+                last = bool(flags & FLAG_LAST)
+                pending.append(self.executor.submit(self.cipher.decode, section, chunk, last, self._read_exact(length, "chunk")))
+                chunk += 1
+
+            data = pending.popleft().result()
+            self.raw_bytes += len(data)
+            yield data
+
+    def sections(self):
+        for section, name in enumerate(self.header['sections']):
+            chunks = self._iter_chunks(section)
+            yield name, chunks
+            # Skip whatever the caller did not consume to reach the next section
+            for _ in chunks:
+                pass
+
+        if self.file.read(1):
+            raise BackupError("Unexpected data after the last section")
+
+
+class _ChunkStream(io.RawIOBase):
+    # Turns a chunk iterator into a readable file for COPY ... FROM STDIN
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.current = b''
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self.current:
+            self.current = next(self.chunks, None)
+            if self.current is None:
+                self.current = b''
+                return 0
+        size = min(len(buffer), len(self.current))
+        buffer[:size] = self.current[:size]
+        self.current = self.current[size:]
+        return size
+
+
+def _private_temp_file(path: str, suffix: str) -> str:
+    # Created owner-only (mkstemp uses mode 0600) next to path, named
+    # .<basename>.<random><suffix>; used for plaintext copies of the database
+    # and for archives being written
+    fd, temp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(path)), prefix=f".{os.path.basename(path)}.", suffix=suffix
+    )
+    os.close(fd)
+    return temp_path
+
+
+def _derive_archive_key(crypto_utils: CryptoUtils, passphrase: str, salt: bytes) -> bytes:
+    return base64.urlsafe_b64decode(crypto_utils.derive_key_from_password(passphrase, salt))
+
+
+def _throughput(raw_bytes: int, archive_bytes: int, seconds: float) -> dict:
+    return {
+        'bytes': raw_bytes,
+        'archive_bytes': archive_bytes,
+        'seconds': seconds,
+        'throughput_mb_s': raw_bytes / (1024 * 1024) / seconds if seconds else 0.0
+    }
+
+
+# Consistent online snapshots of the vault database in encrypted, compressed,
+# chunked archives. SQLite is copied with the backup API; PostgreSQL tables
+# are streamed with binary COPY inside one repeatable-read transaction.
+class BackupManager:
+    def __init__(self, db_manager: 'DatabaseManager', crypto_utils: CryptoUtils, chunk_size: int = CHUNK_SIZE, workers: Optional[int] = None):
+        self.db_manager = db_manager
+        self.crypto_utils = crypto_utils
+        self.chunk_size = chunk_size
+        self.workers = workers or os.cpu_count() or 1
+
+    def _sections(self) -> list:
+        if self.db_manager.backend == 'sqlite':
+            return ['database']
+
+        # PostgreSQL archives hold one binary COPY per table of the live
+        # schema (imported here since it needs psycopg2)
+        from database_manager import TABLES
+        return list(TABLES)
+
+    def create_backup(self, archive_path: str, passphrase: str) -> dict:
+        salt = self.crypto_utils.generate_salt()
+        header = json.dumps({
+            'format': FORMAT_VERSION,
+            'backend': self.db_manager.backend,
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'salt': salt.hex(),
+            'chunk_size': self.chunk_size,
+            'sections': self._sections()
+        }).encode('utf-8')
+        key = _derive_archive_key(self.crypto_utils, passphrase, salt)
+
+        # Written next to the target and renamed, so a failed backup never
+        # leaves a partial archive under the final name
+        temp_path = _private_temp_file(archive_path, '.tmp')
+        start = time.perf_counter()
+        try:
+            with open(temp_path, 'wb') as file, ThreadPoolExecutor(self.workers) as executor:
+                archive = _ArchiveWriter(file, key, header, self.chunk_size, executor, self.workers * 2)
+                if self.db_manager.backend == 'sqlite':
+                    self._backup_sqlite(archive, archive_path)
+                else:
+                    self._backup_postgresql(archive)
+                archive.finish()
+            os.replace(temp_path, archive_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        return _throughput(archive.raw_bytes, os.path.getsize(archive_path), time.perf_counter() - start)
+
+    def _backup_sqlite(self, archive: _ArchiveWriter, archive_path: str):
+        # The unencrypted snapshot exists only while it is being archived; a
+        # killed backup can leave a .*.snapshot file next to the archive
+        snapshot_path = _private_temp_file(archive_path, '.snapshot')
+        try:
+            source = sqlite3.connect(self.db_manager.db_path)
+            target = sqlite3.connect(snapshot_path)
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+                source.close()
+
+            with open(snapshot_path, 'rb') as snapshot, archive.open_section() as section:
+                while True:
+                    data = snapshot.read(self.chunk_size)
+                    if not data:
+                        break
+                    section.write(data)
+        finally:
+            for suffix in ('', '-journal', '-wal', '-shm'):
+                if os.path.exists(snapshot_path + suffix):
+                    os.remove(snapshot_path + suffix)
+
+    def _backup_postgresql(self, archive: _ArchiveWriter):
+        if not self.db_manager.connect():
+            raise BackupError("Could not connect to the database")
+
+        cursor = self.db_manager.connection.cursor()
+        cursor.execute("BEGIN ISOLATION LEVEL REPEATABLE READ READ ONLY")
+        try:
+            for table in self._sections():
+                with archive.open_section() as section:
+                    cursor.copy_expert(f"COPY {table} TO STDOUT WITH (FORMAT binary)", section, self.chunk_size)
+        finally:
+            cursor.execute("COMMIT")
+            cursor.close()
+
+    def _open_archive(self, file, passphrase: str, executor: ThreadPoolExecutor) -> _ArchiveReader:
+        return _ArchiveReader(file, passphrase, self.crypto_utils, executor, self.workers * 2)
+
+    def verify_backup(self, archive_path: str, passphrase: str) -> dict:
+        start = time.perf_counter()
+        with open(archive_path, 'rb') as file, ThreadPoolExecutor(self.workers) as executor:
+            archive = self._open_archive(file, passphrase, executor)
+            for _, chunks in archive.sections():
+                for _ in chunks:
+                    pass
+
+        stats = _throughput(archive.raw_bytes, os.path.getsize(archive_path), time.perf_counter() - start)
+        stats['header'] = archive.header
+        return stats
+
+    def restore_backup(self, archive_path: str, passphrase: str) -> dict:
+        # The API must be stopped: the database is replaced underneath it
+        start = time.perf_counter()
+        with open(archive_path, 'rb') as file, ThreadPoolExecutor(self.workers) as executor:
+            archive = self._open_archive(file, passphrase, executor)
+            if archive.header['backend'] != self.db_manager.backend:
+                raise BackupError(f"Archive is a {archive.header['backend']} backup, the database is {self.db_manager.backend}")
+            if archive.header['sections'] != self._sections():
+                raise BackupError("Archive does not contain the expected tables")
+
+            if self.db_manager.backend == 'sqlite':
+                self._restore_sqlite(archive)
+            else:
+                self._restore_postgresql(archive)
+
+        return _throughput(archive.raw_bytes, os.path.getsize(archive_path), time.perf_counter() - start)
+
+    def _restore_sqlite(self, archive: _ArchiveReader):
+        db_path = self.db_manager.db_path
+        restore_path = _private_temp_file(db_path, '.restore')
+        try:
+            with open(restore_path, 'wb') as restored:
+                for _, chunks in archive.sections():
+                    for data in chunks:
+                        restored.write(data)
+
+            self.db_manager.disconnect()
+            # A leftover WAL belongs to the old database and must not be
+            # replayed into the restored one
+            for suffix in ('-wal', '-shm'):
+                if os.path.exists(db_path + suffix):
+                    os.remove(db_path + suffix)
+            os.replace(restore_path, db_path)
+        finally:
+            if os.path.exists(restore_path):
+                os.remove(restore_path)
+
+    def _restore_postgresql(self, archive: _ArchiveReader):
+        from database_manager import TABLES, SERIAL_TABLES, create_table_sql, add_keys_sql
+
+        if not self.db_manager.connect():
+            raise BackupError("Could not connect to the database")
+
+        cursor = self.db_manager.connection.cursor()
+        cursor.execute("BEGIN")
+        try:
+            # Tables are created without keys, filled with COPY and only then
+            # get their primary keys, unique indexes and foreign keys
+            cursor.execute(f"DROP TABLE IF EXISTS {', '.join(reversed(list(TABLES)))}")
+            for table in TABLES:
+                cursor.execute(create_table_sql(table, include_keys=False))
+
+            for table, chunks in archive.sections():
+                stream = io.BufferedReader(_ChunkStream(chunks), self.chunk_size)
+                cursor.copy_expert(f"COPY {table} FROM STDIN WITH (FORMAT binary)", stream, self.chunk_size)
+
+            # Keys and indexes are built once over the loaded data
+            for table in TABLES:
+                for statement in add_keys_sql(table):
+                    cursor.execute(statement)
+            for table in SERIAL_TABLES:
+                cursor.execute(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE(MAX(id), 1), MAX(id) IS NOT NULL) FROM {table}"
+                )
+
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+        finally:
+            cursor.close()
@@ -1,30 +1,35 @@
 import os
-import bcrypt
-from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import base64
 
+# bcrypt and cryptography are imported inside the methods that use them so
+# that importing this module (and starting an API worker) stays cheap
+
 
 class CryptoUtils:
     def __init__(self):
         self.iterations = 100000
 
     def hash_password(self, password: str) -> tuple:
+        import bcrypt
         salt = bcrypt.gensalt()
         password_hash = bcrypt.hashpw(password.encode('utf-8'), salt)
         return password_hash, salt
 
     def verify_password(self, password: str, password_hash: bytes) -> bool:
+        import bcrypt
         return bcrypt.checkpw(password.encode('utf-8'), password_hash)
 
     def generate_key(self) -> bytes:
+        from cryptography.fernet import Fernet
         return Fernet.generate_key()
 
     def generate_salt(self) -> bytes:
         return os.urandom(32)
 
     def derive_key_from_password(self, password: str, salt: bytes) -> bytes:
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
         kdf = PBKDF2HMAC(
             algorithm=hashes.SHA256(),
             length=32,
@@ -35,6 +40,7 @@ class CryptoUtils:
         return key
 
     def encrypt_data(self, data: str, key: bytes) -> bytes:
+        from cryptography.fernet import Fernet
         if isinstance(data, str):
             data = data.encode('utf-8')
         
@@ -43,16 +49,19 @@ class CryptoUtils:
         return encrypted_data
 
     def decrypt_data(self, encrypted_data: bytes, key: bytes) -> str:
+        from cryptography.fernet import Fernet
         fernet = Fernet(key)
         decrypted_data = fernet.decrypt(encrypted_data)
         return decrypted_data.decode('utf-8')
 
     def encrypt_master_key(self, master_key: bytes, password_derived_key: bytes) -> bytes:
+        from cryptography.fernet import Fernet
         fernet = Fernet(password_derived_key)
         encrypted_master_key = fernet.encrypt(master_key)
         return encrypted_master_key
 
     def decrypt_master_key(self, encrypted_master_key: bytes, password_derived_key: bytes) -> bytes:
+        from cryptography.fernet import Fernet
         fernet = Fernet(password_derived_key)
         master_key = fernet.decrypt(encrypted_master_key)
         return master_key
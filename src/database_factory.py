@@ -0,0 +1,18 @@
+import os
+from typing import Optional
+
+BACKENDS = ('sqlite', 'postgresql')
+
+
+def create_database_manager(backend: Optional[str] = None):
+    # Only the selected backend's driver is imported
+    backend = (backend or os.getenv('DB_BACKEND') or 'sqlite').lower()
+
+    if backend == 'sqlite':
+        from database_manager_sqlite import DatabaseManager
+    elif backend == 'postgresql':
+        from database_manager import DatabaseManager
+    else:
+        raise ValueError(f"Unknown DB_BACKEND '{backend}', expected one of {', '.join(BACKENDS)}")
+
+    return DatabaseManager()
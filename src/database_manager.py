@@ -1,12 +1,100 @@
 import os
+from datetime import datetime
 import psycopg2
 from psycopg2 import sql
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Arbitrary key for pg_advisory_lock, serializes schema setup across workers
+SCHEMA_LOCK_ID = 7262837
+
+# Table definitions in dependency order. Keys are kept apart from the columns
+# so a backup restore can load the rows with COPY first and build them after;
+# the COPY format depends on this exact column order.
+TABLES = {
+    'users': (
+        [
+            "id SERIAL",
+            "username VARCHAR(255) NOT NULL",
+            "password_hash BYTEA NOT NULL",
+            "salt BYTEA NOT NULL",
+            "master_key_salt BYTEA NOT NULL",
+            "encrypted_master_key BYTEA NOT NULL",
+            "created_at TIMESTAMP DEFAULT NOW()",
+        ],
+        [
+            "PRIMARY KEY (id)",
+            "UNIQUE (username)",
+        ]
+    ),
+    'vault_entries': (
+        [
+            "id SERIAL",
+            "user_id INT NOT NULL",
+            "service_name VARCHAR(255) NOT NULL",
+            "username VARCHAR(255) NOT NULL",
+            "encrypted_password BYTEA NOT NULL",
+            "encrypted_notes BYTEA",
+            "created_at TIMESTAMP DEFAULT NOW()",
+            "updated_at TIMESTAMP DEFAULT NOW()",
+        ],
+        [
+            "PRIMARY KEY (id)",
+            "FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE",
+        ]
+    ),
+    # Sessions shared by all API workers
+    'sessions': (
+        [
+            "token VARCHAR(255)",
+            "user_id INT NOT NULL",
+            "username VARCHAR(255) NOT NULL",
+            "encrypted_master_key BYTEA NOT NULL",
+            "created_at TIMESTAMP DEFAULT NOW()",
+        ],
+        [
+            "PRIMARY KEY (token)",
+            "FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE",
+        ]
+    ),
+}
+
+SERIAL_TABLES = tuple(table for table, (columns, _) in TABLES.items() if "id SERIAL" in columns)
+
+
+def create_table_sql(table, include_keys=True):
+    columns, keys = TABLES[table]
+    definitions = columns + keys if include_keys else columns
+    return f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(definitions)})"
+
+
+def add_keys_sql(table):
+    return [f"ALTER TABLE {table} ADD {key}" for key in TABLES[table][1]]
+
+
+def _convert_query(query):
+    # The managers use sqlite-style placeholders
+    return query.replace('?', '%s')
+
+
+def _convert_value(value):
+    # BYTEA columns come back as memoryview, TIMESTAMP columns as datetime;
+    # match what the SQLite backend returns (bytes, 'YYYY-MM-DD HH:MM:SS')
+    if isinstance(value, memoryview):
+        return bytes(value)
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ', timespec='seconds')
+    return value
+
+
+def _convert_row(row):
+    return tuple(_convert_value(value) for value in row)
+
 
 class DatabaseManager:
+    backend = 'postgresql'
+
     def __init__(self):
         self.connection = None
         self.host = os.getenv('DB_HOST', 'localhost')
@@ -43,33 +131,9 @@ class DatabaseManager:
 
         try:
             cursor = self.connection.cursor()
-            
-            # Create users table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS users (
-                    id SERIAL PRIMARY KEY,
-                    username VARCHAR(255) NOT NULL UNIQUE,
-                    password_hash BYTEA NOT NULL,
-                    salt BYTEA NOT NULL,
-                    master_key_salt BYTEA NOT NULL,
-                    encrypted_master_key BYTEA NOT NULL,
-                    created_at TIMESTAMP DEFAULT NOW()
-                )
-            """)
-
-            # Create vault_entries table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS vault_entries (
-                    id SERIAL PRIMARY KEY,
-                    user_id INT NOT NULL REFERENCES users(id) ON DELETE CASCADE,
-                    service_name VARCHAR(255) NOT NULL,
-                    username VARCHAR(255) NOT NULL,
-                    encrypted_password BYTEA NOT NULL,
-                    encrypted_notes BYTEA,
-                    created_at TIMESTAMP DEFAULT NOW(),
-                    updated_at TIMESTAMP DEFAULT NOW()
-                )
-            """)
+
+            for table in TABLES:
+                cursor.execute(create_table_sql(table))
 
             cursor.close()
             return True
@@ -77,29 +141,75 @@ class DatabaseManager:
             print(f"Database initialization error: {e}")
             return False
 
+    def initialize_db_once(self):
+        if not self.connect():
+            return False
+
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("SELECT pg_advisory_lock(%s)", (SCHEMA_LOCK_ID,))
+            try:
+                return self.initialize_db()
+            finally:
+                cursor.execute("SELECT pg_advisory_unlock(%s)", (SCHEMA_LOCK_ID,))
+                cursor.close()
+        except psycopg2.Error as e:
+            print(f"Database initialization error: {e}")
+            return False
+
     def execute_query(self, query, params=None):
         if not self.connect():
             return False
 
         try:
             cursor = self.connection.cursor()
-            cursor.execute(query, params)
+            cursor.execute(_convert_query(query), params)
             cursor.close()
             return True
         except psycopg2.Error as e:
             print(f"Query execution error: {e}")
             return False
 
+    def execute_batch(self, statements):
+        # Runs all statements in one transaction with a single commit. Each
+        # statement gets a savepoint so a failing one does not undo the others.
+        if not self.connect():
+            return [False] * len(statements)
+
+        results = []
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("BEGIN")
+            for query, params in statements:
+                cursor.execute("SAVEPOINT batch_statement")
+                try:
+                    cursor.execute(_convert_query(query), params)
+                    results.append(True)
+                except psycopg2.Error as e:
+                    print(f"Query execution error: {e}")
+                    cursor.execute("ROLLBACK TO SAVEPOINT batch_statement")
+                    results.append(False)
+                cursor.execute("RELEASE SAVEPOINT batch_statement")
+            cursor.execute("COMMIT")
+            cursor.close()
+            return results
+        except psycopg2.Error as e:
+            print(f"Batch execution error: {e}")
+            if not self.connection.closed:
+                # autocommit is on, so end the explicit transaction by hand
+                self.connection.cursor().execute("ROLLBACK")
+            return [False] * len(statements)
+
     def fetch_one(self, query, params=None):
         if not self.connect():
             return None
 
         try:
             cursor = self.connection.cursor()
-            cursor.execute(query, params)
+            cursor.execute(_convert_query(query), params)
             result = cursor.fetchone()
             cursor.close()
-            return result
+            return _convert_row(result) if result else None
         except psycopg2.Error as e:
             print(f"Fetch one error: {e}")
             return None
@@ -110,10 +220,10 @@ class DatabaseManager:
 
         try:
             cursor = self.connection.cursor()
-            cursor.execute(query, params)
+            cursor.execute(_convert_query(query), params)
             results = cursor.fetchall()
             cursor.close()
-            return results
+            return [_convert_row(row) for row in results]
         except psycopg2.Error as e:
             print(f"Fetch all error: {e}")
             return []
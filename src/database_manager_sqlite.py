@@ -2,18 +2,43 @@ import sqlite3
 import os
 from typing import Optional, List, Tuple, Any
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Bumped whenever initialize_db changes the schema
+SCHEMA_VERSION = 1
+
+
+def _lock_file(lock_file):
+    if fcntl:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+    else:
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+
+
+def _unlock_file(lock_file):
+    if fcntl:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    else:
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
 
 class DatabaseManager:
-    def __init__(self):
+    backend = 'sqlite'
+
+    def __init__(self, db_path: Optional[str] = None):
         self.connection = None
-        self.db_path = os.path.join(os.path.dirname(__file__), '..', 'secure_vault.db')
+        self.db_path = db_path or os.getenv('DB_PATH') or os.path.join(os.path.dirname(__file__), '..', 'secure_vault.db')
 
     def connect(self):
         if self.connection:
             return True
 
         try:
-            self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            self.connection = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
             self.connection.row_factory = sqlite3.Row  # Enable column access by name
             return True
         except sqlite3.Error as e:
@@ -31,7 +56,10 @@ class DatabaseManager:
 
         try:
             cursor = self.connection.cursor()
-            
+
+            # WAL lets worker processes read while another one writes
+            cursor.execute("PRAGMA journal_mode=WAL")
+
             # Create users table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS users (
@@ -60,12 +88,41 @@ class DatabaseManager:
                 )
             """)
 
+            # Create sessions table shared by all API workers
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS sessions (
+                    token TEXT PRIMARY KEY,
+                    user_id INTEGER NOT NULL,
+                    username TEXT NOT NULL,
+                    encrypted_master_key BLOB NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+                )
+            """)
+
             self.connection.commit()
+            cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
             return True
         except sqlite3.Error as e:
             print(f"Database initialization error: {e}")
             return False
 
+    def get_schema_version(self) -> int:
+        result = self.fetch_one("PRAGMA user_version")
+        return result[0] if result else 0
+
+    def initialize_db_once(self) -> bool:
+        # Several worker processes may start at the same time; only the first
+        # one to take the lock creates the schema, the others see it is current
+        with open(self.db_path + '.lock', 'a') as lock_file:
+            _lock_file(lock_file)
+            try:
+                if self.connect() and self.get_schema_version() >= SCHEMA_VERSION:
+                    return True
+                return self.initialize_db()
+            finally:
+                _unlock_file(lock_file)
+
     def execute_query(self, query: str, params: Optional[Tuple] = None) -> bool:
         if not self.connect():
             return False
@@ -82,6 +139,33 @@ class DatabaseManager:
             print(f"Query execution error: {e}")
             return False
 
+    def execute_batch(self, statements: List[Tuple[str, Optional[Tuple]]]) -> List[bool]:
+        # Runs all statements in one transaction with a single commit. Each
+        # statement gets a savepoint so a failing one does not undo the others.
+        if not self.connect():
+            return [False] * len(statements)
+
+        results = []
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("BEGIN")
+            for query, params in statements:
+                cursor.execute("SAVEPOINT batch_statement")
+                try:
+                    cursor.execute(query, params or ())
+                    results.append(True)
+                except sqlite3.Error as e:
+                    print(f"Query execution error: {e}")
+                    cursor.execute("ROLLBACK TO SAVEPOINT batch_statement")
+                    results.append(False)
+                cursor.execute("RELEASE SAVEPOINT batch_statement")
+            self.connection.commit()
+            return results
+        except sqlite3.Error as e:
+            print(f"Batch execution error: {e}")
+            self.connection.rollback()
+            return [False] * len(statements)
+
     def fetch_one(self, query: str, params: Optional[Tuple] = None) -> Optional[Tuple]:
         if not self.connect():
             return None
@@ -0,0 +1,116 @@
+import hashlib
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Optional, TYPE_CHECKING
+
+from crypto_utils import CryptoUtils
+
+if TYPE_CHECKING:
+    # The backend is chosen at runtime, see database_factory
+    from database_manager_sqlite import DatabaseManager
+
+# Fixed salt: the session key only has to be reproducible from SECRET_KEY
+# in every worker process, SECRET_KEY itself provides the entropy
+SESSION_KEY_SALT = b'secure-vault-session-store'
+
+# Value shipped in api/.env.example
+PLACEHOLDER_SECRET_KEY = 'your-secret-key-here'
+
+
+def require_secret_key() -> str:
+    # Checked before the server starts: a key generated per process would
+    # differ between workers, and the placeholder is public
+    secret_key = os.getenv('SECRET_KEY')
+    if not secret_key or secret_key == PLACEHOLDER_SECRET_KEY:
+        raise RuntimeError("Set SECRET_KEY in api/.env to a random value shared by all workers")
+    return secret_key
+
+
+def _hash_token(token: str) -> str:
+    # Only a hash of the bearer token is stored, so the table alone cannot
+    # be used to take over a session
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+def _timestamp(moment: datetime) -> str:
+    # Same text format as SQLite's CURRENT_TIMESTAMP, accepted by PostgreSQL
+    return moment.strftime('%Y-%m-%d %H:%M:%S')
+
+
+# Login sessions are kept in the database so every API worker sees them.
+# Master keys are stored encrypted with a key derived from SECRET_KEY,
+# which all workers must share. Sessions expire after SESSION_TTL seconds.
+class SessionStore:
+    def __init__(self, db_manager: 'DatabaseManager', crypto_utils: CryptoUtils, secret_key: Optional[str] = None, ttl: Optional[float] = None):
+        self.db_manager = db_manager
+        self.crypto_utils = crypto_utils
+        self.secret_key = secret_key or os.getenv('SECRET_KEY')
+        self.ttl = ttl if ttl is not None else float(os.getenv('SESSION_TTL', '28800'))
+        self._session_key = None
+
+        if not self.secret_key:
+            raise ValueError("SECRET_KEY must be set to store sessions")
+
+    def _get_session_key(self) -> bytes:
+        if self._session_key is None:
+            self._session_key = self.crypto_utils.derive_key_from_password(self.secret_key, SESSION_KEY_SALT)
+        return self._session_key
+
+    def _expiry_cutoff(self) -> str:
+        return _timestamp(datetime.now(timezone.utc) - timedelta(seconds=self.ttl))
+
+    def purge_expired(self) -> bool:
+        return self.db_manager.execute_query(
+            "DELETE FROM sessions WHERE created_at < ?", (self._expiry_cutoff(),)
+        )
+
+    def create_session(self, token: str, user: dict, master_key: bytes) -> bool:
+        self.purge_expired()
+
+        encrypted_master_key = self.crypto_utils.encrypt_master_key(master_key, self._get_session_key())
+
+        # Only inserted while the user still exists: another worker may have
+        # deleted the account while this one had it cached
+        token_hash = _hash_token(token)
+        self.db_manager.execute_query(
+            """INSERT INTO sessions (token, user_id, username, encrypted_master_key, created_at)
+               SELECT ?, ?, ?, ?, ? WHERE EXISTS (SELECT 1 FROM users WHERE id = ?)""",
+            (token_hash, user['id'], user['username'], encrypted_master_key,
+             _timestamp(datetime.now(timezone.utc)), user['id'])
+        )
+        return self.db_manager.fetch_one("SELECT 1 FROM sessions WHERE token = ?", (token_hash,)) is not None
+
+    def get_session(self, token: str) -> Optional[dict]:
+        # Expired rows are rejected here and removed by the next purge; the
+        # join rejects sessions of deleted users (foreign keys are off in SQLite)
+        session_data = self.db_manager.fetch_one(
+            """SELECT sessions.user_id, sessions.username, sessions.encrypted_master_key
+               FROM sessions JOIN users ON users.id = sessions.user_id
+               WHERE sessions.token = ? AND sessions.created_at >= ?""",
+            (_hash_token(token), self._expiry_cutoff())
+        )
+
+        if not session_data:
+            return None
+
+        user_id, username, encrypted_master_key = session_data
+
+        try:
+            master_key = self.crypto_utils.decrypt_master_key(encrypted_master_key, self._get_session_key())
+        except Exception:
+            # Written under a different SECRET_KEY
+            return None
+
+        return {
+            'user': {
+                'id': user_id,
+                'username': username
+            },
+            'master_key': master_key
+        }
+
+    def delete_session(self, token: str) -> bool:
+        return self.db_manager.execute_query("DELETE FROM sessions WHERE token = ?", (_hash_token(token),))
+
+    def delete_user_sessions(self, user_id: int) -> bool:
+        return self.db_manager.execute_query("DELETE FROM sessions WHERE user_id = ?", (user_id,))
@@ -1,23 +1,48 @@
-from database_manager_sqlite import DatabaseManager
+from typing import Optional, TYPE_CHECKING
+
 from crypto_utils import CryptoUtils
+from write_queue import WriteQueue
+
+if TYPE_CHECKING:
+    # The backend is chosen at runtime, see database_factory
+    from database_manager_sqlite import DatabaseManager
 
 
 class VaultManager:
-    def __init__(self, db_manager: DatabaseManager, crypto_utils: CryptoUtils):
+    def __init__(self, db_manager: 'DatabaseManager', crypto_utils: CryptoUtils, write_queue: Optional[WriteQueue] = None):
         self.db_manager = db_manager
         self.crypto_utils = crypto_utils
+        self.write_queue = write_queue
 
-    def add_entry(self, user_id: int, service_name: str, username: str, password: str, notes: str, master_key: bytes) -> bool:
+    async def _submit_write(self, statement: Optional[tuple]) -> bool:
+        # Group-committed through the write queue when one is configured
+        if statement is None:
+            return True
+        if self.write_queue:
+            return await self.write_queue.submit(*statement)
+        return self.db_manager.execute_query(*statement)
+
+    def _add_entry_statement(self, user_id: int, service_name: str, username: str, password: str, notes: str, master_key: bytes) -> tuple:
         # Encrypt sensitive data
         encrypted_password = self.crypto_utils.encrypt_data(password, master_key)
         encrypted_notes = self.crypto_utils.encrypt_data(notes or "", master_key)
 
-        return self.db_manager.execute_query(
+        return (
             """INSERT INTO vault_entries (user_id, service_name, username, encrypted_password, encrypted_notes)
                VALUES (?, ?, ?, ?, ?)""",
             (user_id, service_name, username, encrypted_password, encrypted_notes)
         )
 
+    def add_entry(self, user_id: int, service_name: str, username: str, password: str, notes: str, master_key: bytes) -> bool:
+        return self.db_manager.execute_query(
+            *self._add_entry_statement(user_id, service_name, username, password, notes, master_key)
+        )
+
+    async def add_entry_async(self, user_id: int, service_name: str, username: str, password: str, notes: str, master_key: bytes) -> bool:
+        return await self._submit_write(
+            self._add_entry_statement(user_id, service_name, username, password, notes, master_key)
+        )
+
     def get_all_entries(self, user_id: int, master_key: bytes) -> list:
         entries_data = self.db_manager.fetch_all(
             """SELECT id, service_name, username, encrypted_password, encrypted_notes, created_at, updated_at
@@ -75,7 +100,7 @@ class VaultManager:
         except Exception:
             return None
 
-    def update_entry(self, user_id: int, entry_id: int, new_password: str, new_notes: str, master_key: bytes) -> bool:
+    def _update_entry_statement(self, user_id: int, entry_id: int, new_password: str, new_notes: str, master_key: bytes) -> Optional[tuple]:
         updates = []
         params = []
 
@@ -90,17 +115,31 @@ class VaultManager:
             params.append(encrypted_notes)
 
         if not updates:
-            return True
+            return None
 
         updates.append("updated_at = CURRENT_TIMESTAMP")
         params.extend([user_id, entry_id])
 
         query = f"UPDATE vault_entries SET {', '.join(updates)} WHERE user_id = ? AND id = ?"
         
-        return self.db_manager.execute_query(query, params)
+        return query, tuple(params)
 
-    def delete_entry(self, user_id: int, entry_id: int) -> bool:
-        return self.db_manager.execute_query(
-            "DELETE FROM vault_entries WHERE user_id = ? AND id = ?",
-            (user_id, entry_id)
+    def update_entry(self, user_id: int, entry_id: int, new_password: str, new_notes: str, master_key: bytes) -> bool:
+        statement = self._update_entry_statement(user_id, entry_id, new_password, new_notes, master_key)
+        if statement is None:
+            return True
+        return self.db_manager.execute_query(*statement)
+
+    async def update_entry_async(self, user_id: int, entry_id: int, new_password: str, new_notes: str, master_key: bytes) -> bool:
+        return await self._submit_write(
+            self._update_entry_statement(user_id, entry_id, new_password, new_notes, master_key)
         )
+
+    def _delete_entry_statement(self, user_id: int, entry_id: int) -> tuple:
+        return "DELETE FROM vault_entries WHERE user_id = ? AND id = ?", (user_id, entry_id)
+
+    def delete_entry(self, user_id: int, entry_id: int) -> bool:
+        return self.db_manager.execute_query(*self._delete_entry_statement(user_id, entry_id))
+
+    async def delete_entry_async(self, user_id: int, entry_id: int) -> bool:
+        return await self._submit_write(self._delete_entry_statement(user_id, entry_id))
@@ -0,0 +1,115 @@
+import asyncio
+import os
+import time
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # The backend is chosen at runtime, see database_factory
+    from database_manager_sqlite import DatabaseManager
+
+
+# Write-behind queue with group commit. Callers await submit(); a single
+# writer task collects statements until max_batch_size is reached or
+# max_delay_ms has passed, runs them in one transaction and resolves every
+# caller once that transaction is committed.
+#
+# Give it its own DatabaseManager: the batch runs in a worker thread and
+# must not share a connection with requests served on the event loop.
+class WriteQueue:
+    def __init__(self, db_manager: 'DatabaseManager', max_batch_size: Optional[int] = None, max_delay_ms: Optional[float] = None):
+        self.db_manager = db_manager
+        self.max_batch_size = max_batch_size if max_batch_size is not None else int(os.getenv('WRITE_BATCH_SIZE', '64'))
+        self.max_delay = (max_delay_ms if max_delay_ms is not None else float(os.getenv('WRITE_BATCH_DELAY_MS', '2'))) / 1000
+        self.batches = 0
+        self.operations = 0
+        self.largest_batch = 0
+        self.total_commit_seconds = 0.0
+        self.max_commit_seconds = 0.0
+        self._queue = None
+        self._task = None
+
+        if self.max_batch_size < 1:
+            raise ValueError("WRITE_BATCH_SIZE must be at least 1")
+        if self.max_delay < 0:
+            raise ValueError("WRITE_BATCH_DELAY_MS must not be negative")
+
+    def _ensure_started(self):
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, query: str, params=None) -> bool:
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((query, params, future))
+        return await future
+
+    async def close(self):
+        # Commits everything already queued, then stops the writer task
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+
+            batch = [item]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._commit(batch)
+
+    async def _commit(self, batch: list):
+        statements = [(query, params) for query, params, _ in batch]
+
+        start = time.perf_counter()
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(None, self.db_manager.execute_batch, statements)
+        except Exception as e:
+            print(f"Write queue error: {e}")
+            results = [False] * len(batch)
+        elapsed = time.perf_counter() - start
+
+        self.batches += 1
+        self.operations += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        self.total_commit_seconds += elapsed
+        self.max_commit_seconds = max(self.max_commit_seconds, elapsed)
+
+        for (_, _, future), result in zip(batch, results):
+            # The caller may have been cancelled while waiting
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            'batches': self.batches,
+            'operations': self.operations,
+            'average_batch_size': self.operations / self.batches if self.batches else 0.0,
+            'largest_batch': self.largest_batch,
+            'average_commit_ms': self.total_commit_seconds / self.batches * 1000 if self.batches else 0.0,
+            'max_commit_ms': self.max_commit_seconds * 1000
+        }
@@ -0,0 +1,169 @@
+import unittest
+import tempfile
+import importlib
+import json
+import sys
+import os
+from unittest import mock
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database_manager_sqlite import DatabaseManager
+from crypto_utils import CryptoUtils
+from vault_manager import VaultManager
+from backup_manager import BackupManager, BackupError, _private_temp_file, MAGIC
+from tests.test_database_manager import fake_psycopg2
+
+
+class TestBackupManager(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_manager = DatabaseManager(os.path.join(self.temp_dir.name, 'vault.db'))
+        self.db_manager.initialize_db_once()
+        self.crypto = CryptoUtils()
+        self.master_key = self.crypto.generate_key()
+
+        self.vault = VaultManager(self.db_manager, self.crypto)
+        for i in range(200):
+            self.vault.add_entry(1, f"service{i}", "user", os.urandom(64).hex(), "notes", self.master_key)
+
+        # Small chunks so the archive has many of them
+        self.backup = BackupManager(self.db_manager, self.crypto, chunk_size=4096, workers=2)
+        self.archive_path = os.path.join(self.temp_dir.name, 'vault.svbak')
+
+    def tearDown(self):
+        self.db_manager.disconnect()
+        self.temp_dir.cleanup()
+
+    def test_backup_and_restore(self):
+        expected = self.vault.get_all_entries(1, self.master_key)
+        stats = self.backup.create_backup(self.archive_path, "passphrase")
+        self.assertEqual(stats['archive_bytes'], os.path.getsize(self.archive_path))
+
+        self.db_manager.execute_query("DELETE FROM vault_entries")
+        self.backup.restore_backup(self.archive_path, "passphrase")
+
+        self.assertEqual(self.vault.get_all_entries(1, self.master_key), expected)
+
+    def test_archive_is_encrypted(self):
+        self.vault.add_entry(1, "plaintext_marker_service", "user", "secret", "", self.master_key)
+        self.backup.create_backup(self.archive_path, "passphrase")
+
+        with open(self.archive_path, 'rb') as archive:
+            self.assertNotIn(b"plaintext_marker_service", archive.read())
+
+    def test_no_plaintext_copy_left_behind(self):
+        self.backup.create_backup(self.archive_path, "passphrase")
+        self.backup.restore_backup(self.archive_path, "passphrase")
+
+        leftovers = [name for name in os.listdir(self.temp_dir.name) if name.endswith(('.snapshot', '.restore', '.tmp'))]
+        self.assertEqual(leftovers, [])
+
+    def test_failed_backup_leaves_nothing(self):
+        with mock.patch.object(self.backup, '_backup_sqlite', side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.backup.create_backup(self.archive_path, "passphrase")
+        self.assertEqual([name for name in os.listdir(self.temp_dir.name) if 'svbak' in name], [])
+
+    @unittest.skipIf(os.name == 'nt', "POSIX permissions")
+    def test_plaintext_copy_owner_only(self):
+        temp_path = _private_temp_file(self.archive_path, '.snapshot')
+        self.assertEqual(os.stat(temp_path).st_mode & 0o777, 0o600)
+        os.remove(temp_path)
+
+    def test_wrong_passphrase(self):
+        self.backup.create_backup(self.archive_path, "passphrase")
+        with self.assertRaises(BackupError):
+            self.backup.verify_backup(self.archive_path, "wrong")
+
+    def test_corrupted_archive(self):
+        self.backup.create_backup(self.archive_path, "passphrase")
+        with open(self.archive_path, 'r+b') as archive:
+            archive.seek(-100, os.SEEK_END)
+            byte = archive.read(1)
+            archive.seek(-100, os.SEEK_END)
+            archive.write(bytes([byte[0] ^ 1]))
+
+        with self.assertRaises(BackupError):
+            self.backup.verify_backup(self.archive_path, "passphrase")
+
+    def test_truncated_archive(self):
+        self.backup.create_backup(self.archive_path, "passphrase")
+        size = os.path.getsize(self.archive_path)
+        with open(self.archive_path, 'r+b') as archive:
+            archive.truncate(size - 5000)
+
+        with self.assertRaises(BackupError):
+            self.backup.restore_backup(self.archive_path, "passphrase")
+        self.assertEqual(len(self.vault.get_all_entries(1, self.master_key)), 200)
+
+    def write_archive(self, header: bytes, frames: bytes = b''):
+        with open(self.archive_path, 'wb') as archive:
+            archive.write(MAGIC + len(header).to_bytes(4, 'big') + header + frames)
+
+    def test_corrupt_header(self):
+        valid = {'format': 1, 'backend': 'sqlite', 'salt': '00' * 16, 'chunk_size': 4096, 'sections': ['database']}
+        headers = [b'{x', b'[]', json.dumps(dict(valid, salt='xyz')).encode('utf-8')]
+        for field in ('salt', 'backend', 'sections', 'chunk_size'):
+            headers.append(json.dumps({key: value for key, value in valid.items() if key != field}).encode('utf-8'))
+
+        for header in headers:
+            self.write_archive(header)
+            with self.assertRaisesRegex(BackupError, "header is corrupt"):
+                self.backup.verify_backup(self.archive_path, "passphrase")
+
+    def test_oversized_frame(self):
+        header = {'format': 1, 'backend': 'sqlite', 'salt': '00' * 16, 'chunk_size': 4096, 'sections': ['database']}
+        self.write_archive(json.dumps(header).encode('utf-8'), (2 ** 31).to_bytes(4, 'big') + b'\x01')
+
+        with self.assertRaisesRegex(BackupError, "oversized"):
+            self.backup.verify_backup(self.archive_path, "passphrase")
+
+
+class TestPostgresBackup(unittest.TestCase):
+    def setUp(self):
+        psycopg2 = fake_psycopg2()
+        patcher = mock.patch.dict(sys.modules, {'psycopg2': psycopg2, 'psycopg2.sql': psycopg2.sql})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        sys.modules.pop('database_manager', None)
+        self.addCleanup(sys.modules.pop, 'database_manager', None)
+
+        self.database_manager = importlib.import_module('database_manager')
+        self.db_manager = self.database_manager.DatabaseManager()
+        self.db_manager.connection = mock.Mock(closed=False)
+        self.cursor = self.db_manager.connection.cursor.return_value
+        self.copied = {}
+
+        def copy_expert(statement, file, size):
+            table = statement.split()[1]
+            if 'TO STDOUT' in statement:
+                file.write(f"rows of {table}".encode('utf-8'))
+            else:
+                self.copied[table] = file.read()
+        self.cursor.copy_expert.side_effect = copy_expert
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.archive_path = os.path.join(self.temp_dir.name, 'vault.svbak')
+        self.backup = BackupManager(self.db_manager, CryptoUtils(), chunk_size=4096, workers=2)
+
+    def test_restore_builds_keys_after_load(self):
+        self.backup.create_backup(self.archive_path, "passphrase")
+        self.cursor.execute.reset_mock()
+        self.backup.restore_backup(self.archive_path, "passphrase")
+
+        tables = list(self.database_manager.TABLES)
+        self.assertEqual(self.copied, {table: f"rows of {table}".encode('utf-8') for table in tables})
+
+        statements = [call.args[0] for call in self.cursor.execute.call_args_list]
+        creates = [self.database_manager.create_table_sql(table, include_keys=False) for table in tables]
+        keys = [statement for table in tables for statement in self.database_manager.add_keys_sql(table)]
+        self.assertEqual(statements[2:2 + len(creates)], creates)
+        self.assertEqual(statements[2 + len(creates):2 + len(creates) + len(keys)], keys)
+        self.assertEqual(statements[-1], "COMMIT")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+import importlib
+import types
+import sys
+import os
+from datetime import datetime
+from unittest import mock
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+
+def fake_psycopg2():
+    # Enough of psycopg2 to import database_manager without a server
+    module = types.ModuleType('psycopg2')
+    module.Error = type('Error', (Exception,), {})
+    module.connect = mock.Mock()
+    module.sql = types.ModuleType('psycopg2.sql')
+    return module
+
+
+class TestPostgresDatabaseManager(unittest.TestCase):
+    def setUp(self):
+        psycopg2 = fake_psycopg2()
+        patcher = mock.patch.dict(sys.modules, {'psycopg2': psycopg2, 'psycopg2.sql': psycopg2.sql})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        sys.modules.pop('database_manager', None)
+        self.addCleanup(sys.modules.pop, 'database_manager', None)
+
+        self.database_manager = database_manager = importlib.import_module('database_manager')
+        self.db_manager = database_manager.DatabaseManager()
+        self.db_manager.connection = mock.Mock(closed=False)
+        self.cursor = self.db_manager.connection.cursor.return_value
+
+    def test_placeholders_translated(self):
+        self.db_manager.execute_query("DELETE FROM vault_entries WHERE user_id = ? AND id = ?", (1, 2))
+        self.cursor.execute.assert_called_once_with("DELETE FROM vault_entries WHERE user_id = %s AND id = %s", (1, 2))
+
+    def test_rows_converted(self):
+        self.cursor.fetchall.return_value = [
+            (1, memoryview(b'secret'), datetime(2026, 1, 2, 3, 4, 5, 678901), None)
+        ]
+
+        rows = self.db_manager.fetch_all("SELECT id, encrypted_password, created_at, encrypted_notes FROM vault_entries")
+        self.assertEqual(rows, [(1, b'secret', '2026-01-02 03:04:05', None)])
+
+    def test_initialize_db_uses_table_definitions(self):
+        self.assertTrue(self.db_manager.initialize_db())
+
+        statements = [call.args[0] for call in self.cursor.execute.call_args_list]
+        self.assertEqual(statements, [self.database_manager.create_table_sql(table) for table in self.database_manager.TABLES])
+        self.assertIn("PRIMARY KEY (id)", statements[0])
+        self.assertNotIn("PRIMARY KEY", self.database_manager.create_table_sql('users', include_keys=False))
+
+    def test_fetch_one_missing_row(self):
+        self.cursor.fetchone.return_value = None
+        self.assertIsNone(self.db_manager.fetch_one("SELECT id FROM users WHERE username = ?", ("alice",)))
+
+
+if __name__ == '__main__':
+    unittest.main()
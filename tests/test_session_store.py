@@ -0,0 +1,110 @@
+import unittest
+import tempfile
+import sys
+import os
+from unittest import mock
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database_manager_sqlite import DatabaseManager, SCHEMA_VERSION
+from crypto_utils import CryptoUtils
+from session_store import SessionStore, require_secret_key, PLACEHOLDER_SECRET_KEY
+
+
+class TestSessionStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'vault.db')
+        self.db_manager = DatabaseManager(self.db_path)
+        self.db_manager.initialize_db_once()
+        self.crypto = CryptoUtils()
+        self.store = SessionStore(self.db_manager, self.crypto, secret_key="test_secret")
+        self.user = {'id': 1, 'username': 'alice'}
+        self.db_manager.execute_query(
+            """INSERT INTO users (id, username, password_hash, salt, master_key_salt, encrypted_master_key)
+               VALUES (1, 'alice', x'00', x'00', x'00', x'00')"""
+        )
+
+    def tearDown(self):
+        self.db_manager.disconnect()
+        self.temp_dir.cleanup()
+
+    def test_initialize_db_once(self):
+        self.assertEqual(self.db_manager.get_schema_version(), SCHEMA_VERSION)
+
+        other_worker = DatabaseManager(self.db_path)
+        self.assertTrue(other_worker.initialize_db_once())
+        other_worker.disconnect()
+
+    def test_session_shared_between_workers(self):
+        master_key = self.crypto.generate_key()
+        self.assertTrue(self.store.create_session("token", self.user, master_key))
+
+        other_worker = DatabaseManager(self.db_path)
+        other_store = SessionStore(other_worker, CryptoUtils(), secret_key="test_secret")
+        session = other_store.get_session("token")
+        other_worker.disconnect()
+
+        self.assertEqual(session['user'], self.user)
+        self.assertEqual(session['master_key'], master_key)
+
+    def test_master_key_not_stored_in_plaintext(self):
+        master_key = self.crypto.generate_key()
+        self.store.create_session("token", self.user, master_key)
+
+        stored = self.db_manager.fetch_one("SELECT encrypted_master_key FROM sessions")
+        self.assertNotIn(master_key, stored[0])
+
+    def test_token_stored_hashed(self):
+        self.store.create_session("token", self.user, self.crypto.generate_key())
+        self.assertIsNone(self.db_manager.fetch_one("SELECT 1 FROM sessions WHERE token = ?", ("token",)))
+
+    def test_expired_session(self):
+        self.store.create_session("old", self.user, self.crypto.generate_key())
+        self.db_manager.execute_query("UPDATE sessions SET created_at = '2000-01-01 00:00:00'")
+        self.assertIsNone(self.store.get_session("old"))
+
+        # Creating another session purges the expired row
+        self.store.create_session("new", self.user, self.crypto.generate_key())
+        self.assertEqual(self.db_manager.fetch_one("SELECT COUNT(*) FROM sessions")[0], 1)
+        self.assertIsNotNone(self.store.get_session("new"))
+
+    def test_deleted_user(self):
+        self.store.create_session("token", self.user, self.crypto.generate_key())
+        self.db_manager.execute_query("DELETE FROM users WHERE id = ?", (1,))
+
+        self.assertIsNone(self.store.get_session("token"))
+        self.assertFalse(self.store.create_session("new", self.user, self.crypto.generate_key()))
+
+    def test_wrong_secret_key(self):
+        self.store.create_session("token", self.user, self.crypto.generate_key())
+
+        other_store = SessionStore(self.db_manager, self.crypto, secret_key="other_secret")
+        self.assertIsNone(other_store.get_session("token"))
+
+    def test_delete_sessions(self):
+        master_key = self.crypto.generate_key()
+        self.store.create_session("token1", self.user, master_key)
+        self.store.create_session("token2", self.user, master_key)
+
+        self.store.delete_session("token1")
+        self.assertIsNone(self.store.get_session("token1"))
+        self.assertIsNotNone(self.store.get_session("token2"))
+
+        self.store.delete_user_sessions(self.user['id'])
+        self.assertIsNone(self.store.get_session("token2"))
+
+
+    def test_require_secret_key(self):
+        for value in ("", PLACEHOLDER_SECRET_KEY):
+            with mock.patch.dict(os.environ, {'SECRET_KEY': value}):
+                with self.assertRaises(RuntimeError):
+                    require_secret_key()
+
+        with mock.patch.dict(os.environ, {'SECRET_KEY': "test_secret"}):
+            self.assertEqual(require_secret_key(), "test_secret")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+import subprocess
+import tempfile
+import sys
+import os
+
+API_DIR = os.path.join(os.path.dirname(__file__), '..', 'api')
+
+# Seconds allowed for importing api/main.py in a fresh interpreter,
+# override with COLD_START_BUDGET on slow machines
+COLD_START_BUDGET = float(os.getenv('COLD_START_BUDGET', '1.5'))
+
+# Modules that must not be loaded until the first request needs them
+DEFERRED_MODULES = ('bcrypt', 'cryptography', 'psycopg2', 'sqlite3')
+
+IMPORT_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import main
+print(time.perf_counter() - start)
+print(','.join(name for name in %r if name in sys.modules))
+""" % (DEFERRED_MODULES,)
+
+
+class TestStartup(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        env = dict(os.environ, SECRET_KEY="test_secret", DB_PATH=os.path.join(cls.temp_dir.name, 'vault.db'))
+        result = subprocess.run(
+            [sys.executable, '-c', IMPORT_SCRIPT],
+            cwd=API_DIR, env=env, capture_output=True, text=True, check=True
+        )
+        lines = result.stdout.splitlines()
+        cls.import_seconds = float(lines[-2])
+        cls.loaded_modules = [name for name in lines[-1].split(',') if name]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def test_cold_start_budget(self):
+        self.assertLess(self.import_seconds, COLD_START_BUDGET)
+
+    def test_heavy_modules_deferred(self):
+        self.assertEqual(self.loaded_modules, [])
+
+    def test_database_not_created_on_import(self):
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir.name, 'vault.db')))
+
+
+if __name__ == '__main__':
+    unittest.main()
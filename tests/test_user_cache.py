@@ -0,0 +1,113 @@
+import unittest
+import tempfile
+import time
+import sys
+import os
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database_manager_sqlite import DatabaseManager
+from crypto_utils import CryptoUtils
+from auth_manager import AuthManager
+from user_cache import UserCache
+from session_store import SessionStore
+
+
+class TestUserCache(unittest.TestCase):
+    def test_hits_and_misses(self):
+        cache = UserCache(max_size=4, ttl=60)
+        self.assertIsNone(cache.get("alice"))
+
+        cache.set("alice", (1, "alice"))
+        self.assertEqual(cache.get("alice"), (1, "alice"))
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_least_recently_used_evicted(self):
+        cache = UserCache(max_size=2, ttl=60)
+        cache.set("alice", (1,))
+        cache.set("bob", (2,))
+        cache.get("alice")
+        cache.set("carol", (3,))
+
+        self.assertIsNone(cache.get("bob"))
+        self.assertEqual(cache.get("alice"), (1,))
+        self.assertEqual(cache.stats()['size'], 2)
+
+    def test_expired_entries(self):
+        cache = UserCache(max_size=4, ttl=0.01)
+        cache.set("alice", (1,))
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("alice"))
+        self.assertEqual(cache.stats()['size'], 0)
+
+    def test_invalidate(self):
+        cache = UserCache(max_size=4, ttl=60)
+        cache.set("alice", (1,))
+        cache.invalidate("alice")
+        self.assertIsNone(cache.get("alice"))
+
+
+class TestAuthManagerCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'vault.db')
+        self.db_manager = DatabaseManager(self.db_path)
+        self.db_manager.initialize_db_once()
+        self.auth = AuthManager(self.db_manager, CryptoUtils(), UserCache(max_size=16, ttl=60))
+        self.auth.register_user("alice", "password123")
+
+    def tearDown(self):
+        self.db_manager.disconnect()
+        self.temp_dir.cleanup()
+
+    def test_repeated_login_uses_cache(self):
+        self.assertIsNotNone(self.auth.login_user("alice", "password123"))
+        self.assertIsNotNone(self.auth.login_user("alice", "password123"))
+        self.assertEqual(self.auth.user_cache.stats()['hits'], 1)
+
+    def test_user_exists_does_not_fill_cache(self):
+        self.assertTrue(self.auth.user_exists("alice"))
+        self.assertEqual(self.auth.user_cache.stats()['size'], 0)
+
+    def test_unknown_user_not_cached(self):
+        self.assertFalse(self.auth.user_exists("bob"))
+        self.assertTrue(self.auth.register_user("bob", "password123"))
+        self.assertTrue(self.auth.user_exists("bob"))
+
+    def test_register_ignores_stale_cache(self):
+        # Another worker deleted alice while this one still has her cached
+        self.auth.login_user("alice", "password123")
+        self.db_manager.execute_query("DELETE FROM users WHERE username = ?", ("alice",))
+
+        self.assertTrue(self.auth.register_user("alice", "new_password123"))
+        self.assertIsNotNone(self.auth.login_user("alice", "new_password123"))
+
+    def test_delete_invalidates(self):
+        result = self.auth.login_user("alice", "password123")
+        self.assertTrue(self.auth.delete_user(result['user']['id'], "alice"))
+
+        self.assertFalse(self.auth.user_exists("alice"))
+        self.assertIsNone(self.auth.login_user("alice", "password123"))
+
+    def test_account_deleted_on_other_worker(self):
+        # This worker has alice cached when another worker deletes her
+        self.assertIsNotNone(self.auth.login_user("alice", "password123"))
+        other_db = DatabaseManager(self.db_path)
+        self.addCleanup(other_db.disconnect)
+        other_auth = AuthManager(other_db, CryptoUtils(), UserCache(max_size=16, ttl=60))
+        user_id = other_auth.login_user("alice", "password123")['user']['id']
+        self.assertTrue(other_auth.delete_user(user_id, "alice"))
+
+        # The stale cache still accepts the password, the database does not
+        result = self.auth.login_user("alice", "password123")
+        self.assertIsNotNone(result)
+        store = SessionStore(self.db_manager, CryptoUtils(), secret_key="test_secret")
+        self.assertFalse(store.create_session("token", result['user'], result['master_key']))
+        self.assertIsNone(store.get_session("token"))
+        self.assertEqual(self.db_manager.fetch_one("SELECT COUNT(*) FROM sessions")[0], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+import asyncio
+import tempfile
+import sys
+import os
+from unittest import mock
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database_manager_sqlite import DatabaseManager
+from crypto_utils import CryptoUtils
+from vault_manager import VaultManager
+from write_queue import WriteQueue
+
+
+class TestWriteQueue(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'vault.db')
+        self.db_manager = DatabaseManager(self.db_path)
+        self.db_manager.initialize_db_once()
+        self.writer_db = DatabaseManager(self.db_path)
+        self.crypto = CryptoUtils()
+        self.master_key = self.crypto.generate_key()
+
+    def tearDown(self):
+        self.writer_db.disconnect()
+        self.db_manager.disconnect()
+        self.temp_dir.cleanup()
+
+    def run_writes(self, write_queue, count):
+        vault = VaultManager(self.db_manager, self.crypto, write_queue)
+
+        async def write_all():
+            results = await asyncio.gather(*(
+                vault.add_entry_async(1, f"service{i}", "user", "secret", "", self.master_key)
+                for i in range(count)
+            ))
+            await write_queue.close()
+            return results
+
+        return asyncio.run(write_all())
+
+    def test_concurrent_writes_group_committed(self):
+        write_queue = WriteQueue(self.writer_db, max_batch_size=16, max_delay_ms=5)
+        results = self.run_writes(write_queue, 50)
+
+        self.assertTrue(all(results))
+        self.assertEqual(self.db_manager.fetch_one("SELECT COUNT(*) FROM vault_entries")[0], 50)
+
+        stats = write_queue.stats()
+        self.assertEqual(stats['operations'], 50)
+        self.assertLess(stats['batches'], 50)
+        self.assertLessEqual(stats['largest_batch'], 16)
+
+    def test_failed_statement_does_not_fail_batch(self):
+        write_queue = WriteQueue(self.writer_db, max_batch_size=8, max_delay_ms=5)
+
+        async def write_all():
+            results = await asyncio.gather(
+                write_queue.submit("INSERT INTO users (username) VALUES (?)", ("missing_columns",)),
+                write_queue.submit("DELETE FROM vault_entries WHERE id = ?", (1,))
+            )
+            await write_queue.close()
+            return results
+
+        self.assertEqual(asyncio.run(write_all()), [False, True])
+
+    def test_without_queue(self):
+        vault = VaultManager(self.db_manager, self.crypto)
+        result = asyncio.run(vault.add_entry_async(1, "service", "user", "secret", "", self.master_key))
+
+        self.assertTrue(result)
+        self.assertEqual(len(vault.get_all_entries(1, self.master_key)), 1)
+
+
+    def test_batch_settings(self):
+        # Zero is an explicit value, not a request for the default
+        with self.assertRaises(ValueError):
+            WriteQueue(self.writer_db, max_batch_size=0)
+        with self.assertRaises(ValueError):
+            WriteQueue(self.writer_db, max_delay_ms=-1)
+        with mock.patch.dict(os.environ, {'WRITE_BATCH_SIZE': '0'}):
+            with self.assertRaises(ValueError):
+                WriteQueue(self.writer_db)
+
+        self.assertEqual(WriteQueue(self.writer_db, max_delay_ms=0).max_delay, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()